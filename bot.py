@@ -29,6 +29,8 @@ class PepperBot(commands.Bot):
             limit=50,
             limit_per_host=10,
             ttl_dns_cache=600,
+            # Keep idle pepper.pl connections across a staggered burst of group/search requests
+            keepalive_timeout=60,
             enable_cleanup_closed=True,
             force_close=False,
         )
@@ -1,8 +1,11 @@
 import asyncio
 import datetime
+import heapq
 import logging
-from collections import defaultdict
+import time
 from functools import wraps
+from itertools import islice
+from operator import itemgetter
 from typing import Any, Callable, Dict, Optional, List
 
 import discord
@@ -10,18 +13,83 @@ from discord import app_commands
 from discord.ext import commands, tasks
 
 from utils.alerts import AlertsManager
-from utils.category_manager import CategoryManager
+from utils.category_manager import SCHEDULE_WINDOW_SECONDS, WEEKDAY_NAMES, CategoryManager
 from utils.config import Config
+from utils.deal_filter import DealFilter
 from utils.scraper import PepperScraper
 from utils.views import DealPaginator
 
 logger = logging.getLogger("PepperBot.Cogs")
 
-CATEGORY_STAGGER_DELAY = 2
+CATEGORY_CONCURRENCY = 4
+# Upper bound on one scheduler sleep, as a guard against wall-clock jumps
+SCHEDULE_MAX_SLEEP_SECONDS = 900
+ALERT_DM_WORKERS = 8
+DM_SEND_RETRIES = 3
+# Discord's per-message caps on embed count and combined embed text
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
 MAX_DEALS_PER_NOTIFICATION = 10
+MAX_DEALS_PER_ALERT = 5
 MAX_CATEGORIES_PER_GUILD = 20
 CLEANUP_INTERVAL_HOURS = 24
 CLEANUP_DAYS_OLD = 30
+ALERT_FOOTER = f"PepperWatch • Sprawdzam co {Config.WATCH_INTERVAL_MINUTES} minut"
+
+# Temperatures above these get the hot and very-hot icons respectively
+_TEMP_HOT = 300
+_TEMP_VERY_HOT = 500
+
+# Both scraper parse paths always set an int temperature on every deal
+_temperature_key = itemgetter('temperature')
+
+_SLUG_TABLE = str.maketrans(' ', '-')
+
+
+def _hottest_deals(deals: List[Dict], k: int) -> List[Dict]:
+    """Return up to k deals ordered by temperature, sorting in place when all of them fit."""
+    if len(deals) <= k:
+        deals.sort(key=_temperature_key, reverse=True)
+        return deals
+    return heapq.nlargest(k, deals, key=_temperature_key)
+
+
+def _embed_batches(embeds: List[discord.Embed]) -> List[List[discord.Embed]]:
+    """Split embeds into consecutive groups that fit within a single Discord message."""
+    batches = []
+    batch: List[discord.Embed] = []
+    size = 0
+    for embed in embeds:
+        embed_size = len(embed)
+        if batch and (
+            len(batch) == MAX_EMBEDS_PER_MESSAGE
+            or size + embed_size > MAX_EMBED_CHARS_PER_MESSAGE
+        ):
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(embed)
+        size += embed_size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _temperature_icon(temp: int) -> str:
+    return '🌋' if temp > _TEMP_VERY_HOT else ('🔥' if temp > _TEMP_HOT else '❄️')
+
+
+def _truncate(text: str, limit: int = 80) -> str:
+    return text if len(text) <= limit else f"{text[:limit]}…"
+
+
+def _format_deal_field(i: int, deal: Dict, merchant_emoji: str, link_label: str) -> tuple[str, str]:
+    """Embed field (name, value) for the i-th deal of a digest."""
+    temp = deal.get('temperature', 0)
+    return (
+        f"{i}. {_truncate(deal['title'])}",
+        f"💰 **{deal.get('price') or '???'}** | {_temperature_icon(temp)} {temp}° | "
+        f"{merchant_emoji} {deal.get('merchant', 'Unknown')}\n[🔗 {link_label}]({deal['link']})",
+    )
 
 
 def text_command_error_handler(func):
@@ -30,7 +98,10 @@ def text_command_error_handler(func):
         try:
             await func(self, message, *args, **kwargs)
         except Exception as e:
-            logger.error(f"Error in {func.__name__}: {e}", exc_info=True)
+            # Tracebacks only when debugging; at ERROR the message is enough
+            logger.error(
+                "Error in %s: %s", func.__name__, e, exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
             try:
                 await message.reply(f"⚠️ Error: {e}", delete_after=10)
             except:
@@ -48,21 +119,44 @@ class PepperCommands(commands.Cog):
         description="Manage automated category notifications"
     )
 
+    # Text commands of the form "p <name>:<args>", keyed by <name>
+    _PREFIX_DISPATCH = {
+        'watch': '_handle_watch_command',
+        'unwatch': '_handle_unwatch_command',
+        'group': '_handle_group_command',
+        'preview': '_handle_preview_command',
+    }
+
+    # Argument-less text commands "p <name>"
+    _EXACT_DISPATCH = {
+        'alerts': '_handle_list_command',
+        'list': '_handle_list_command',
+        'hot': '_handle_hot_command',
+        'fly': '_handle_fly_command',
+    }
+
     def __init__(self, bot):
         self.bot = bot
         self.alerts_manager = AlertsManager(self.bot.db)
         self.category_manager = CategoryManager(self.bot.db)
+        self._category_sem = asyncio.Semaphore(CATEGORY_CONCURRENCY)
+        self._schedule_heap: Optional[List[tuple[float, int]]] = None
+        self._schedule_wake = asyncio.Event()
+        self._scraper: Optional[PepperScraper] = None
+        # One ready waiter shared by every task's before_loop
+        self._ready: asyncio.Future = asyncio.ensure_future(self.bot.wait_until_ready())
 
         self.flight_deals_task.start()
         self.alerts_task.start()
-        self.category_notification_task.start()
+        self._category_task = asyncio.create_task(self._category_scheduler_loop())
         self.cleanup_task.start()
 
     def cog_unload(self):
         self.flight_deals_task.cancel()
         self.alerts_task.cancel()
-        self.category_notification_task.cancel()
+        self._category_task.cancel()
         self.cleanup_task.cancel()
+        self._ready.cancel()
 
     @tasks.loop(time=datetime.time(hour=Config.FLIGHT_SCHEDULE_HOUR, minute=0))
     async def flight_deals_task(self):
@@ -70,7 +164,7 @@ class PepperCommands(commands.Cog):
 
     @flight_deals_task.before_loop
     async def before_flight_task(self):
-        await self.bot.wait_until_ready()
+        await asyncio.shield(self._ready)
 
     @tasks.loop(minutes=Config.WATCH_INTERVAL_MINUTES)
     async def alerts_task(self):
@@ -78,50 +172,117 @@ class PepperCommands(commands.Cog):
 
     @alerts_task.before_loop
     async def before_alerts_task(self):
-        await self.bot.wait_until_ready()
-
-    @tasks.loop(minutes=1)
-    async def category_notification_task(self):
+        await asyncio.shield(self._ready)
+
+    async def _category_scheduler_loop(self):
+        """Sleep until the next category is due, waking early when the schedule changes."""
+        await asyncio.shield(self._ready)
+        while True:
+            # Cleared before reading the heap so an invalidation during the wait is not lost
+            self._schedule_wake.clear()
+            try:
+                if self._schedule_heap is None:
+                    await self._rebuild_schedule()
+                
+                delay = SCHEDULE_MAX_SLEEP_SECONDS
+                if self._schedule_heap:
+                    delay = min(delay, self._schedule_heap[0][0] - time.time())
+                
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._schedule_wake.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                
+                await self._run_due_categories()
+            except Exception as e:
+                logger.error(f"Error in category scheduler: {e}", exc_info=True)
+                await asyncio.sleep(60)
+    
+    async def _run_due_categories(self):
         try:
-            categories = await self.bot.db.get_active_categories_for_schedule()
+            now = time.time()
+            due_ids = []
+            while self._schedule_heap and self._schedule_heap[0][0] <= now:
+                due_ids.append(heapq.heappop(self._schedule_heap)[1])
             
-            if not categories:
+            if not due_ids:
                 return
             
-            logger.info(f"Checking {len(categories)} active categories for scheduled runs")
+            categories = await self.bot.db.get_categories_by_ids(due_ids)
+            
+            logger.info("Checking %d due categories for scheduled runs", len(categories))
             
             to_process = [cat for cat in categories if self.category_manager.should_run_now(cat)]
+            self._push_schedule(categories, datetime.datetime.fromtimestamp(now))
+            
+            # Disable everything pointing at deleted channels in one UPDATE, before any scraping
+            dead_channels = {
+                cat['channel_id'] for cat in to_process if not self.bot.get_channel(cat['channel_id'])
+            }
+            if dead_channels:
+                disabled = await self.bot.db.disable_categories_for_channels(list(dead_channels))
+                logger.warning(f"Disabled {disabled} categories whose channels no longer exist")
+                self._invalidate_schedule()
+                to_process = [cat for cat in to_process if cat['channel_id'] not in dead_channels]
             
             if not to_process:
                 return
             
-            logger.info(f"Processing {len(to_process)} categories")
+            logger.info("Processing %d categories", len(to_process))
             
-            for i, category in enumerate(to_process):
-                try:
-                    if i > 0:
-                        await asyncio.sleep(CATEGORY_STAGGER_DELAY)
-                    
+            async def _run(category):
+                async with self._category_sem:
                     await self.process_category_notification(category)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing category {category['slug']}: {e}", exc_info=True)
+            
+            results = await asyncio.gather(
+                *(_run(category) for category in to_process), return_exceptions=True
+            )
+            
+            for category, result in zip(to_process, results, strict=True):
+                if isinstance(result, Exception):
+                    logger.error(
+                        f"Error processing category {category['slug']}: {result}",
+                        exc_info=result,
+                    )
                     await self.bot.db.update_category_stats(category['id'], 0, 0, errors=1)
         
-        except Exception as e:
-            logger.error(f"Error in category notification task: {e}", exc_info=True)
+        except Exception:
+            # Due ids are already off the heap, so rebuild it and let the scheduler loop back off
+            self._invalidate_schedule()
+            raise
     
-    @category_notification_task.before_loop
-    async def before_category_task(self):
-        await self.bot.wait_until_ready()
+    async def _rebuild_schedule(self):
+        """Rebuild the next-due heap from every active category."""
+        categories = await self.bot.db.get_active_categories_for_schedule()
+        # Start one window back so a slot that just passed still fires after a restart
+        after = datetime.datetime.now() - datetime.timedelta(seconds=SCHEDULE_WINDOW_SECONDS)
+        self._schedule_heap = []
+        self._push_schedule(categories, after)
+    
+    def _push_schedule(self, categories: List[Dict[str, Any]], after: datetime.datetime):
+        # A pending rebuild will pick these up from the DB instead
+        if self._schedule_heap is None:
+            return
+        for category in categories:
+            next_run = self.category_manager.next_run_at(category, after)
+            if next_run is not None:
+                heapq.heappush(self._schedule_heap, (next_run.timestamp(), category['id']))
+    
+    def _invalidate_schedule(self):
+        """Drop the next-due heap after a config change and wake the scheduler to rebuild it."""
+        self._schedule_heap = None
+        self._schedule_wake.set()
     
     @tasks.loop(hours=CLEANUP_INTERVAL_HOURS)
     async def cleanup_task(self):
         try:
             logger.info("Running scheduled cleanup task...")
             
-            deleted_deals = await self.bot.db.cleanup_old_deals(days=CLEANUP_DAYS_OLD)
-            deleted_category_deals = await self.bot.db.cleanup_category_deals(days=CLEANUP_DAYS_OLD)
+            deleted_deals, deleted_category_deals = await self.bot.db.cleanup_all(
+                days=CLEANUP_DAYS_OLD
+            )
             
             logger.info(
                 f"Cleanup complete: {deleted_deals} flight deals, "
@@ -132,7 +293,14 @@ class PepperCommands(commands.Cog):
     
     @cleanup_task.before_loop
     async def before_cleanup_task(self):
-        await self.bot.wait_until_ready()
+        await asyncio.shield(self._ready)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        disabled = await self.bot.db.disable_categories_for_channels([channel.id])
+        if disabled:
+            logger.info("Disabled %d categories for deleted channel %s", disabled, channel.id)
+            self._invalidate_schedule()
     
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -143,43 +311,27 @@ class PepperCommands(commands.Cog):
         if not content:
             return
         
-        handlers = {
-            'watch:': lambda: self._handle_watch_command(message, content),
-            'unwatch:': lambda: self._handle_unwatch_command(message, content),
-            'group:': lambda: self._handle_group_command(message, content),
-            'preview:': lambda: self._handle_preview_command(message, content),
-            'cat ': lambda: self._handle_category_command(message, content),
-        }
+        # Every handler is wrapped in text_command_error_handler
+        if content.startswith('clean'):
+            await self._handle_clean_command(message, content)
+            return
         
-        exact_handlers = {
-            'alerts': lambda: self._handle_list_command(message),
-            'list': lambda: self._handle_list_command(message),
-            'hot': lambda: self._handle_hot_command(message),
-            'fly': lambda: self._handle_fly_command(message),
-        }
+        head, sep, args = content.partition(':')
+        handler_name = self._PREFIX_DISPATCH.get(head) if sep else None
+        if handler_name is not None:
+            await getattr(self, handler_name)(message, args)
+            return
         
-        try:
-            if content.startswith('clean'):
-                await self._handle_clean_command(message, content)
-                return
-            
-            for prefix, handler in handlers.items():
-                if content.startswith(prefix):
-                    await handler()
-                    return
-            
-            if content in exact_handlers:
-                await exact_handlers[content]()
-                return
-            
-            await self._handle_search_command(message, content)
-            
-        except Exception as e:
-            logger.error(f"Error in text command handler: {e}", exc_info=True)
-            try:
-                await message.reply(f"⚠️ Error processing command: {e}", delete_after=10)
-            except:
-                pass
+        if content.startswith('cat '):
+            await self._handle_category_command(message, content.removeprefix('cat '))
+            return
+        
+        handler_name = self._EXACT_DISPATCH.get(content)
+        if handler_name is not None:
+            await getattr(self, handler_name)(message)
+            return
+        
+        await self._handle_search_command(message, content)
 
     def parse_price_from_text(self, text: str) -> tuple[str, Optional[float], Optional[str]]:
         for op, op_type in [('<', 'max'), ('>', 'min')]:
@@ -198,10 +350,14 @@ class PepperCommands(commands.Cog):
         except (discord.Forbidden, discord.NotFound):
             pass
         except Exception as e:
-            logger.debug(f"Could not delete message: {e}")
+            logger.debug("Could not delete message: %s", e)
+
+    @staticmethod
+    def _normalize_slug(slug: str) -> str:
+        return slug.strip().lower().translate(_SLUG_TABLE)
 
     def get_temperature_icon(self, temp: int) -> str:
-        return '🌋' if temp > 500 else ('🔥' if temp > 300 else '❄️')
+        return _temperature_icon(temp)
 
     async def _add_alert_shared(self, user_id: int, query: str, max_price: Optional[float]) -> tuple[bool, str]:
         current = await self.alerts_manager.get_alerts(user_id)
@@ -228,28 +384,27 @@ class PepperCommands(commands.Cog):
             return False, f"⚠️ Alert **{query}** not found.\nUse `p alerts` to see your list."
 
     def _build_alerts_embed(self, alerts: List[Dict]) -> discord.Embed:
+        lines = ["Watching these queries:"]
+        for i, a in enumerate(alerts, 1):
+            price_info = f"**< {a['max_price']} zł**" if a["max_price"] else "Any price"
+            lines.append(f"**{i}. {a['query']}** — 💰 {price_info}")
+        
         embed = discord.Embed(
             title="🔔 Your Alerts",
-            description="Watching these queries:",
+            description="\n".join(lines),
             color=Config.COLOR_PRIMARY,
         )
-        
-        for i, a in enumerate(alerts, 1):
-            price_info = f"**< {a['max_price']} zł**" if a["max_price"] else "Any price"
-            embed.add_field(name=f"{i}. {a['query']}", value=f"💰 {price_info}", inline=False)
-        
         embed.set_footer(text="Use p unwatch:query to remove")
         return embed
 
-    def _build_category_list_embed(self, categories: List[Dict]) -> discord.Embed:
-        embed = discord.Embed(
-            title="📋 Active Categories",
-            description=f"Managing {len(categories)} automated notifications",
-            color=Config.COLOR_PRIMARY
-        )
+    def _build_category_list_embed(
+        self, categories: List[Dict], mark_protected: bool = False
+    ) -> discord.Embed:
+        lines = [f"Managing {len(categories)} automated notifications"]
+        emojis = self.category_manager.get_category_emojis([cat['slug'] for cat in categories])
         
         for i, cat in enumerate(categories, 1):
-            emoji = self.category_manager.get_category_emoji(cat['slug'])
+            emoji = emojis[cat['slug']]
             
             filters = []
             if cat.get('min_temperature', 0) > 0:
@@ -260,13 +415,18 @@ class PepperCommands(commands.Cog):
             filter_str = " | ".join(filters) if filters else "No filters"
             schedule_str = self.category_manager.format_schedule(cat)
             status_emoji = "✅" if cat['status'] == 'active' else "⏸️"
+            protected = " [PROTECTED]" if mark_protected and cat['slug'] == 'bilety-lotnicze' else ""
             
-            value = f"{status_emoji} {schedule_str}\n📍 <#{cat['channel_id']}>\n{filter_str}"
-            name = f"{i}. {emoji} {cat['slug']}"
-            
-            embed.add_field(name=name, value=value, inline=False)
+            lines.append(
+                f"**{i}. {emoji} {cat['slug']}**{protected} — {status_emoji} {schedule_str}"
+                f" · <#{cat['channel_id']}> · {filter_str}"
+            )
         
-        return embed
+        return discord.Embed(
+            title="📋 Active Categories",
+            description="\n".join(lines),
+            color=Config.COLOR_PRIMARY
+        )
 
     async def _validate_and_create_category(
         self,
@@ -280,14 +440,11 @@ class PepperCommands(commands.Cog):
         min_temp: int,
         max_price: Optional[float]
     ) -> tuple[bool, Optional[str], Optional[int]]:
-        slug = slug.lower().strip()
-        
-        existing = await self.bot.db.get_category_by_slug(guild_id, slug)
-        if existing:
+        summary = await self.bot.db.get_guild_category_summary(guild_id)
+        if slug in summary['slugs']:
             return False, f"⚠️ Category **{slug}** already exists.", None
         
-        guild_categories = await self.bot.db.get_guild_categories(guild_id)
-        if len(guild_categories) >= MAX_CATEGORIES_PER_GUILD:
+        if summary['count'] >= MAX_CATEGORIES_PER_GUILD:
             return False, f"❌ Maximum {MAX_CATEGORIES_PER_GUILD} categories per server.", None
         
         valid, error = await self.category_manager.validate_slug(self.scraper, slug)
@@ -317,11 +474,11 @@ class PepperCommands(commands.Cog):
         if not category_id:
             return False, "❌ Database error.", None
         
+        self._invalidate_schedule()
         return True, None, category_id
 
     @text_command_error_handler
-    async def _handle_watch_command(self, message: discord.Message, content: str):
-        args = content[6:].strip()
+    async def _handle_watch_command(self, message: discord.Message, args: str):
         query, price, price_type = self.parse_price_from_text(args)
         
         if not query:
@@ -334,8 +491,8 @@ class PepperCommands(commands.Cog):
         await self.safe_delete_message(message)
 
     @text_command_error_handler
-    async def _handle_unwatch_command(self, message: discord.Message, content: str):
-        query = content[8:].strip()
+    async def _handle_unwatch_command(self, message: discord.Message, args: str):
+        query = args.strip()
         
         if not query:
             await message.reply("❌ Usage: `p unwatch:query`", delete_after=10)
@@ -366,44 +523,38 @@ class PepperCommands(commands.Cog):
         title_template: str,
         error_msg: str
     ):
-        try:
-            from utils.deal_filter import DealFilter
-            
-            result = await scraper_method(*method_args)
-            
-            if not result["success"]:
-                await message.reply(f"❌ Error: {result.get('error', 'Unknown')}", delete_after=10)
-                return
-            
-            all_deals = result["deals"]
-            deals = DealFilter.filter_deals(
-                all_deals,
-                check_freshness=True,
-                check_temperature=True,
-                check_price=True
-            )
-            
-            if not deals:
-                if all_deals:
-                    await message.reply(
-                        f"🔍 Found {len(all_deals)} deals, but none met quality standards.\n"
-                        f"Filters: Recent (<24h), Hot (≥50°), Valid price",
-                        delete_after=20
-                    )
-                else:
-                    await message.reply(error_msg, delete_after=10)
-                return
-            
-            view = DealPaginator(deals, message.author)
-            embed = view.get_initial_embed()
-            
-            await message.reply(content=title_template.format(count=len(deals)), embed=embed, view=view)
-            await self.safe_delete_message(message)
+        result = await scraper_method(*method_args)
         
-        except Exception as e:
-            logger.error(f"Error in search command: {e}", exc_info=True)
-            await message.reply(f"⚠️ Error: {e}", delete_after=10)
+        if not result["success"]:
+            await message.reply(f"❌ Error: {result.get('error', 'Unknown')}", delete_after=10)
+            return
+        
+        all_deals = result["deals"]
+        deals = DealFilter.filter_deals(
+            all_deals,
+            check_freshness=True,
+            check_temperature=True,
+            check_price=True
+        )
+        
+        if not deals:
+            if all_deals:
+                await message.reply(
+                    f"🔍 Found {len(all_deals)} deals, but none met quality standards.\n"
+                    f"Filters: Recent (<24h), Hot (≥50°), Valid price",
+                    delete_after=20
+                )
+            else:
+                await message.reply(error_msg, delete_after=10)
+            return
+        
+        view = DealPaginator(deals, message.author)
+        embed = view.get_initial_embed()
+        
+        await message.reply(content=title_template.format(count=len(deals)), embed=embed, view=view)
+        await self.safe_delete_message(message)
 
+    @text_command_error_handler
     async def _handle_search_command(self, message: discord.Message, query: str):
         await self._handle_search_generic(
             message,
@@ -413,6 +564,7 @@ class PepperCommands(commands.Cog):
             f"🤷 No deals found for: **{query}**"
         )
 
+    @text_command_error_handler
     async def _handle_hot_command(self, message: discord.Message):
         await self._handle_search_generic(
             message,
@@ -422,8 +574,9 @@ class PepperCommands(commands.Cog):
             "🤷 No hot deals found."
         )
 
-    async def _handle_group_command(self, message: discord.Message, content: str):
-        slug = content[6:].strip().lower().replace(' ', '-')
+    @text_command_error_handler
+    async def _handle_group_command(self, message: discord.Message, args: str):
+        slug = self._normalize_slug(args)
         
         if not slug:
             await message.reply("❌ Usage: `p group:slug`", delete_after=10)
@@ -438,8 +591,8 @@ class PepperCommands(commands.Cog):
         )
 
     @text_command_error_handler
-    async def _handle_preview_command(self, message: discord.Message, content: str):
-        slug = content[8:].strip().lower()
+    async def _handle_preview_command(self, message: discord.Message, args: str):
+        slug = self._normalize_slug(args)
         
         if not slug:
             await message.reply("❌ Usage: `p preview:slug`", delete_after=10)
@@ -468,7 +621,7 @@ class PepperCommands(commands.Cog):
             
             value = f"💰 {deal.get('price', '???')} | {icon} {temp}° | 🪐 {deal.get('merchant', 'Unknown')}"
             embed.add_field(
-                name=f"{i}. {deal['title'][:60]}...",
+                name=f"{i}. {_truncate(deal['title'], 60)}",
                 value=value,
                 inline=False
             )
@@ -500,36 +653,41 @@ class PepperCommands(commands.Cog):
         await message.reply(f"🗑️ Deleted {len(deleted)} messages", delete_after=5)
         await self.safe_delete_message(message)
 
-    async def _handle_category_command(self, message: discord.Message, content: str):
+    @text_command_error_handler
+    async def _handle_category_command(self, message: discord.Message, args: str):
         if not message.author.guild_permissions.administrator:
             await message.reply("❌ Admin only command.", delete_after=10)
             return
         
-        cat_content = content[4:].strip()
+        cat_content = args.strip()
         
         cat_handlers = {
             'list': lambda: self._handle_cat_list(message),
-            'add:': lambda: self._handle_cat_add(message, cat_content[4:]),
-            'rm:': lambda: self._handle_cat_remove(message, cat_content[3:]),
-            'pause:': lambda: self._handle_cat_status_change(message, cat_content[6:], 'paused'),
-            'resume:': lambda: self._handle_cat_status_change(message, cat_content[7:], 'active'),
-            'run:': lambda: self._handle_cat_trigger(message, cat_content[4:]),
+            'add:': lambda: self._handle_cat_add(message, cat_content.removeprefix('add:')),
+            'rm:': lambda: self._handle_cat_remove(
+                message, self._normalize_slug(cat_content.removeprefix('rm:'))
+            ),
+            'pause:': lambda: self._handle_cat_status_change(
+                message, self._normalize_slug(cat_content.removeprefix('pause:')), 'paused'
+            ),
+            'resume:': lambda: self._handle_cat_status_change(
+                message, self._normalize_slug(cat_content.removeprefix('resume:')), 'active'
+            ),
+            'run:': lambda: self._handle_cat_trigger(
+                message, self._normalize_slug(cat_content.removeprefix('run:'))
+            ),
         }
         
-        try:
-            if cat_content == 'list':
-                await cat_handlers['list']()
-            else:
-                for prefix, handler in cat_handlers.items():
-                    if cat_content.startswith(prefix) and prefix != 'list':
-                        await handler()
-                        return
-                
-                await message.reply("❌ Usage: `p cat [list|add:slug|rm:slug|pause:slug|resume:slug|run:slug]`", delete_after=10)
+        if cat_content == 'list':
+            await cat_handlers['list']()
+            return
         
-        except Exception as e:
-            logger.error(f"Error in category command: {e}", exc_info=True)
-            await message.reply(f"⚠️ Error: {e}", delete_after=10)
+        for prefix, handler in cat_handlers.items():
+            if cat_content.startswith(prefix) and prefix != 'list':
+                await handler()
+                return
+        
+        await message.reply("❌ Usage: `p cat [list|add:slug|rm:slug|pause:slug|resume:slug|run:slug]`", delete_after=10)
 
     @text_command_error_handler
     async def _handle_cat_list(self, message: discord.Message):
@@ -551,7 +709,7 @@ class PepperCommands(commands.Cog):
             await message.reply("❌ Usage: `p cat add:slug frequency time #channel [day] [min:temp] [max:price]`", delete_after=15)
             return
         
-        slug = parts[0].lower().strip()
+        slug = self._normalize_slug(parts[0])
         frequency = parts[1].lower()
         time = parts[2]
         
@@ -571,13 +729,13 @@ class PepperCommands(commands.Cog):
         min_temp = 0
         max_price = None
         
-        for part in parts:
+        for part in (p.lower() for p in parts):
             if part.startswith('min:'):
                 min_temp = int(part[4:])
             elif part.startswith('max:'):
                 max_price = float(part[4:])
-            elif part.lower() in ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']:
-                day = part.lower()
+            elif part in WEEKDAY_NAMES:
+                day = part
             elif part.isdigit() and 1 <= int(part) <= 31 and frequency == 'monthly':
                 date = int(part)
         
@@ -590,7 +748,10 @@ class PepperCommands(commands.Cog):
             return
         
         emoji = self.category_manager.get_category_emoji(slug)
-        schedule = {'type': frequency, 'time': time, 'day': day, 'date': date}
+        schedule = {
+            'schedule_type': frequency, 'schedule_time': time,
+            'schedule_day': day, 'schedule_date': date,
+        }
         
         msg = f"✅ Category added: {emoji} **{slug}**\n"
         msg += f"📅 {self.category_manager.format_schedule(schedule)}\n"
@@ -601,13 +762,13 @@ class PepperCommands(commands.Cog):
 
     @text_command_error_handler
     async def _handle_cat_remove(self, message: discord.Message, slug: str):
-        slug = slug.strip().lower()
-        
         if slug == 'bilety-lotnicze':
             await message.reply("🔒 Cannot remove protected category.", delete_after=10)
             return
         
         removed = await self.bot.db.remove_category_config(message.guild.id, slug)
+        if removed:
+            self._invalidate_schedule()
         
         msg = f"🗑️ Removed category: **{slug}**" if removed else f"⚠️ Category **{slug}** not found."
         await message.reply(msg, delete_after=10)
@@ -615,9 +776,9 @@ class PepperCommands(commands.Cog):
 
     @text_command_error_handler
     async def _handle_cat_status_change(self, message: discord.Message, slug: str, new_status: str):
-        slug = slug.strip().lower()
-        
         updated = await self.bot.db.update_category_status(message.guild.id, slug, new_status)
+        if updated:
+            self._invalidate_schedule()
         
         status_emoji = "⏸️" if new_status == 'paused' else "▶️"
         status_text = "Paused" if new_status == 'paused' else "Resumed"
@@ -628,8 +789,6 @@ class PepperCommands(commands.Cog):
 
     @text_command_error_handler
     async def _handle_cat_trigger(self, message: discord.Message, slug: str):
-        slug = slug.strip().lower()
-        
         category = await self.bot.db.get_category_by_slug(message.guild.id, slug)
         if not category:
             await message.reply(f"⚠️ Category **{slug}** not found.", delete_after=10)
@@ -653,6 +812,7 @@ class PepperCommands(commands.Cog):
                     await self.bot.db.update_category_status(
                         category['guild_id'], category['slug'], 'disabled'
                     )
+                    self._invalidate_schedule()
                 return
             
             result = await self.scraper.get_group_deals(category['slug'], limit=20)
@@ -669,50 +829,52 @@ class PepperCommands(commands.Cog):
             
             deals = result['deals']
             if not deals:
-                logger.info(f"No deals found for {category['slug']}")
+                logger.info("No deals found for %s", category['slug'])
                 if interaction:
                     await interaction.followup.send(
                         f"🤷 No deals found for **{category['slug']}**", ephemeral=True
                     )
-                await self.bot.db.update_category_stats(category['id'], 0, 0)
+                await self.bot.db.finalize_category_run(category['id'], 0, 0)
                 return
             
             new_deals = []
             batch_to_mark = []
-            
+
+            sent_ids = await self.bot.db.get_sent_deal_ids(
+                category['id'], [deal['link'] for deal in deals]
+            )
+
+            category_id = category['id']
+            min_temp = category.get('min_temperature') or 0
+            max_price = category.get('max_price')
             for deal in deals:
                 deal_id = deal['link']
                 
-                if category.get('min_temperature', 0) > 0:
-                    if deal.get('temperature', 0) < category['min_temperature']:
-                        continue
+                if min_temp > 0 and deal.get('temperature', 0) < min_temp:
+                    continue
                 
-                if category.get('max_price'):
-                    deal_price = self._parse_price(deal.get('price'))
-                    if deal_price > 0 and deal_price > category['max_price']:
-                        continue
+                # Unparseable prices come back as 0.0 and are never filtered out
+                if max_price and self._deal_price(deal) > max_price:
+                    continue
                 
-                is_sent = await self.bot.db.is_category_deal_sent(category['id'], deal_id)
-                
-                if manual_trigger or not is_sent:
+                if manual_trigger or deal_id not in sent_ids:
                     new_deals.append(deal)
                     if not manual_trigger:
-                        batch_to_mark.append((category['id'], deal_id))
+                        batch_to_mark.append((category_id, deal_id))
             
             if batch_to_mark:
                 await self.bot.db.mark_category_deals_sent_batch(batch_to_mark)
             
             if not new_deals:
-                logger.info(f"No new deals for {category['slug']}")
+                logger.info("No new deals for %s", category['slug'])
                 if interaction:
                     await interaction.followup.send(
                         f"No new deals since last check for **{category['slug']}**", ephemeral=True
                     )
-                await self.bot.db.update_category_stats(category['id'], len(deals), 0)
+                await self.bot.db.finalize_category_run(category['id'], len(deals), 0)
                 return
             
-            new_deals.sort(key=lambda x: x.get('temperature', 0), reverse=True)
-            top_deals = new_deals[:MAX_DEALS_PER_NOTIFICATION]
+            top_deals = _hottest_deals(new_deals, MAX_DEALS_PER_NOTIFICATION)
             
             emoji = self.category_manager.get_category_emoji(category['slug'])
             
@@ -722,20 +884,10 @@ class PepperCommands(commands.Cog):
                 color=Config.COLOR_PRIMARY
             )
             
+            add_field = embed.add_field
             for i, deal in enumerate(top_deals, 1):
-                price = deal.get('price') or '???'
-                temp = deal.get('temperature', 0)
-                merchant = deal.get('merchant', 'Unknown')
-                
-                icon = self.get_temperature_icon(temp)
-                
-                value_str = f"💰 **{price}** | {icon} {temp}° | 🪐 {merchant}\n[🔗 View deal]({deal['link']})"
-                
-                embed.add_field(
-                    name=f"{i}. {deal['title'][:80]}...",
-                    value=value_str,
-                    inline=False
-                )
+                name, value = _format_deal_field(i, deal, '🪐', 'View deal')
+                add_field(name=name, value=value, inline=False)
             
             schedule_str = self.category_manager.format_schedule(category)
             embed.set_footer(text=f"Pepper.pl • {schedule_str}")
@@ -745,11 +897,10 @@ class PepperCommands(commands.Cog):
             
             await channel.send(embed=embed)
             
-            await self.bot.db.update_category_last_run(category['id'])
-            await self.bot.db.update_category_stats(category['id'], len(deals), len(new_deals))
+            await self.bot.db.finalize_category_run(category['id'], len(deals), len(new_deals))
             
             if not manual_trigger:
-                logger.info(f"Sent {len(top_deals)} deals for category {category['slug']}")
+                logger.info("Sent %d deals for category %s", len(top_deals), category['slug'])
             elif interaction:
                 await interaction.followup.send(
                     f"✅ Sent {len(top_deals)} deals to {channel.mention}", ephemeral=True
@@ -762,74 +913,136 @@ class PepperCommands(commands.Cog):
                     "⚠️ An unexpected error occurred. Please try again later.", ephemeral=True
                 )
     
-    def _parse_price(self, price_str: Optional[str]) -> float:
-        if not price_str:
-            return 0.0
-        try:
-            clean = price_str.lower().replace('zł', '').replace(' ', '').replace(',', '.')
-            if 'darm' in clean or 'free' in clean or 'bezpłatn' in clean:
-                return 0.0
-            return float(clean)
-        except ValueError:
-            return 0.0
+    def _deal_price(self, deal: Dict[str, Any]) -> float:
+        """Parsed price of a deal, with missing or unparseable prices as 0.0."""
+        return DealFilter.price_of(deal) or 0.0
 
     async def process_alerts(self):
         try:
             notifications = await self.alerts_manager.check_alerts(self.scraper)
+            if not notifications:
+                return
             
-            grouped = defaultdict(lambda: defaultdict(list))
+            grouped: Dict[int, Dict[str, list]] = {}
             for notif in notifications:
-                grouped[notif["user_id"]][notif["query"]].append(notif["deal"])
+                grouped.setdefault(notif["user_id"], {}).setdefault(notif["query"], []).append(
+                    notif["deal"]
+                )
             
+            users = await self._resolve_users(list(grouped))
+            queue: asyncio.Queue = asyncio.Queue()
             for user_id, queries_dict in grouped.items():
-                user = self.bot.get_user(user_id)
-                if not user:
-                    try:
-                        user = await self.bot.fetch_user(user_id)
-                    except (discord.NotFound, Exception) as e:
-                        logger.warning(f"Could not fetch user {user_id}: {e}")
-                        continue
-                
-                for query, deals in queries_dict.items():
-                    try:
-                        deals_sorted = sorted(deals, key=lambda d: d.get('temperature', 0), reverse=True)
-                        top_deals = deals_sorted[:5]
-                        
-                        embed = discord.Embed(
-                            title=f"🚨 {len(deals)} {'nowa okazja' if len(deals) == 1 else 'nowych okazji'} dla: {query}",
-                            color=Config.COLOR_SUCCESS
-                        )
-                        
-                        for i, deal in enumerate(top_deals, 1):
-                            temp = deal.get('temperature', 0)
-                            icon = self.get_temperature_icon(temp)
-                            
-                            value = f"💰 **{deal['price']}** | {icon} {temp}°\n[🔗 Zobacz okazję]({deal['link']})"
-                            
-                            embed.add_field(
-                                name=f"{i}. {deal['title'][:70]}...",
-                                value=value,
-                                inline=False
-                            )
-                        
-                        if top_deals[0].get('image_url'):
-                            embed.set_thumbnail(url=top_deals[0]['image_url'])
-                        
-                        embed.set_footer(text="PepperWatch • Sprawdzam co 15 minut")
-                        
-                        await user.send(embed=embed)
-                        logger.info(f"Sent {len(top_deals)} deals to {user.name} for query '{query}'")
-                        
-                        await asyncio.sleep(0.5)
-                    
-                    except discord.Forbidden:
-                        logger.warning(f"Cannot send DM to {user.name} ({user_id})")
-                    except Exception as e:
-                        logger.error(f"Error sending alert to {user_id}: {e}", exc_info=True)
+                if user_id in users:
+                    queue.put_nowait((users[user_id], queries_dict))
+            
+            if queue.empty():
+                return
+            
+            workers = [
+                asyncio.create_task(self._dm_worker(queue))
+                for _ in range(min(ALERT_DM_WORKERS, queue.qsize()))
+            ]
+            try:
+                await queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
         
         except Exception as e:
             logger.error(f"Error in alerts task: {e}", exc_info=True)
 
+    async def _dm_worker(self, queue: asyncio.Queue):
+        while True:
+            user, queries_dict = await queue.get()
+            try:
+                await self._send_user_alerts(user, queries_dict)
+            except Exception as e:
+                logger.error(f"Error sending alerts to {user.id}: {e}", exc_info=True)
+            finally:
+                queue.task_done()
+
+    async def _resolve_users(self, user_ids: List[int]) -> Dict[int, discord.User]:
+        """Resolve users from cache, fetching all cache misses concurrently."""
+        users = {}
+        missing = []
+        for user_id in user_ids:
+            user = self.bot.get_user(user_id)
+            if user:
+                users[user_id] = user
+            else:
+                missing.append(user_id)
+        
+        fetched = await asyncio.gather(
+            *(self.bot.fetch_user(user_id) for user_id in missing), return_exceptions=True
+        )
+        for user_id, user in zip(missing, fetched, strict=True):
+            if isinstance(user, Exception):
+                logger.warning(f"Could not fetch user {user_id}: {user}")
+            else:
+                users[user_id] = user
+        return users
+
+    async def _send_user_alerts(self, user: discord.User, queries_dict: Dict[str, list]):
+        # Deals matching several of the user's queries are only shown once
+        seen_links = set()
+        embeds = []
+        for query, deals in queries_dict.items():
+            # Stable sort keeps scrape order among equal temperatures; skip repeats before the cut
+            top_deals = list(islice(
+                (
+                    deal for deal in sorted(deals, key=_temperature_key, reverse=True)
+                    if deal['link'] not in seen_links
+                ),
+                MAX_DEALS_PER_ALERT,
+            ))
+            if not top_deals:
+                continue
+            seen_links.update(deal['link'] for deal in top_deals)
+            embeds.append(self._build_alert_embed(query, len(deals), top_deals))
+        
+        # One DM per batch of query embeds rather than one per query
+        for batch in _embed_batches(embeds):
+            try:
+                await self._send_dm(user, batch)
+                logger.info("Sent %d alert embeds to %s", len(batch), user.name)
+            except discord.Forbidden:
+                logger.warning(f"Cannot send DM to {user.name} ({user.id})")
+                return
+            except Exception as e:
+                logger.error(f"Error sending alert to {user.id}: {e}", exc_info=True)
+
+    def _build_alert_embed(self, query: str, total: int, top_deals: List[Dict]) -> discord.Embed:
+        embed_data = {
+            'title': f"🚨 {total} {'nowa okazja' if total == 1 else 'nowych okazji'} dla: {query}",
+            'color': Config.COLOR_SUCCESS,
+            'fields': [
+                {
+                    'name': f"{i}. {_truncate(deal['title'], 70)}",
+                    'value': f"💰 **{deal['price']}** | {_temperature_icon(deal.get('temperature', 0))} "
+                             f"{deal.get('temperature', 0)}°\n[🔗 Zobacz okazję]({deal['link']})",
+                    'inline': False,
+                }
+                for i, deal in enumerate(top_deals, 1)
+            ],
+            'footer': {'text': ALERT_FOOTER},
+        }
+        if top_deals[0].get('image_url'):
+            embed_data['thumbnail'] = {'url': top_deals[0]['image_url']}
+        return discord.Embed.from_dict(embed_data)
+
+    async def _send_dm(self, user: discord.User, embeds: List[discord.Embed]):
+        """Send a DM, backing off on 429 for as long as Discord asks."""
+        for attempt in range(DM_SEND_RETRIES):
+            try:
+                await user.send(embeds=embeds)
+                return
+            except discord.HTTPException as e:
+                if e.status != 429 or attempt == DM_SEND_RETRIES - 1:
+                    raise
+                retry_after = float(e.response.headers.get('Retry-After', 1))
+                logger.warning(f"Rate limited sending DM to {user.id}, retrying in {retry_after}s")
+                await asyncio.sleep(retry_after)
+
     async def process_flight_deals(
         self, manual_trigger: bool = False, interaction: discord.Interaction = None
     ):
@@ -866,15 +1079,12 @@ class PepperCommands(commands.Cog):
                     )
                 return
 
-            new_deals = []
-            for deal in deals:
-                deal_id = deal["link"]
-                is_sent = await self.bot.db.is_deal_sent(deal_id)
-
-                if manual_trigger or not is_sent:
-                    new_deals.append(deal)
-                    if not manual_trigger:
-                        await self.bot.db.add_sent_deal(deal_id)
+            if manual_trigger:
+                new_deals = deals
+            else:
+                sent = await self.bot.db.get_sent_subset([deal["link"] for deal in deals])
+                new_deals = [deal for deal in deals if deal["link"] not in sent]
+                await self.bot.db.add_sent_deals_batch([deal["link"] for deal in new_deals])
 
             if not new_deals:
                 logger.info("No new flight deals found.")
@@ -884,35 +1094,30 @@ class PepperCommands(commands.Cog):
                     )
                 return
 
-            new_deals.sort(key=lambda x: x.get("temperature", 0), reverse=True)
-            top_deals = new_deals[:MAX_DEALS_PER_NOTIFICATION]
-
-            embed = discord.Embed(
-                title=f"✈️ Dzienny Raport Lotniczy - {datetime.date.today()}",
-                description=f"Znaleziono **{len(new_deals)}** okazji. Oto najlepsze z nich:",
-                color=Config.COLOR_PRIMARY,
-            )
-
-            for i, deal in enumerate(top_deals, 1):
-                price = deal.get("price") or "???"
-                temp = deal.get("temperature", 0)
-                merchant = deal.get("merchant", "Unknown")
-
-                icon = self.get_temperature_icon(temp)
-
-                value_str = f"💰 **{price}** | {icon} {temp}° | 🏪 {merchant}\n[🔗 Zobacz okazję]({deal['link']})"
-
-                embed.add_field(name=f"{i}. {deal['title'][:80]}...", value=value_str, inline=False)
-
-            embed.set_footer(text="Pepper.pl Bot • Aktualizacja codzienna o 08:00")
-
+            top_deals = _hottest_deals(new_deals, MAX_DEALS_PER_NOTIFICATION)
+
+            today = datetime.date.today()
+            embed_data = {
+                "title": f"✈️ Dzienny Raport Lotniczy - {today}",
+                "description": f"Znaleziono **{len(new_deals)}** okazji. Oto najlepsze z nich:",
+                "color": Config.COLOR_PRIMARY,
+                "fields": [
+                    {"name": name, "value": value, "inline": False}
+                    for name, value in (
+                        _format_deal_field(i, deal, '🏪', 'Zobacz okazję')
+                        for i, deal in enumerate(top_deals, 1)
+                    )
+                ],
+                "footer": {"text": "Pepper.pl Bot • Aktualizacja codzienna o 08:00"},
+            }
             if top_deals and top_deals[0].get("image_url"):
-                embed.set_thumbnail(url=top_deals[0]["image_url"])
+                embed_data["thumbnail"] = {"url": top_deals[0]["image_url"]}
+            embed = discord.Embed.from_dict(embed_data)
 
             await target_channel.send(embed=embed)
 
             if not manual_trigger:
-                logger.info(f"Sent flight digest with {len(top_deals)} deals.")
+                logger.info("Sent flight digest with %d deals.", len(top_deals))
             elif interaction:
                 await interaction.followup.send("✅ Wysłano raport lotniczy.", ephemeral=True)
 
@@ -923,7 +1128,9 @@ class PepperCommands(commands.Cog):
 
     @property
     def scraper(self) -> PepperScraper:
-        return PepperScraper(self.bot.session)
+        if self._scraper is None:
+            self._scraper = PepperScraper(self.bot.session)
+        return self._scraper
 
     async def _send_deals(
         self,
@@ -989,7 +1196,7 @@ class PepperCommands(commands.Cog):
     @app_commands.describe(group="Slug grupy (np. elektronika, gry, dom-i-ogrod)")
     async def group_pepper(self, interaction: discord.Interaction, group: str):
         await interaction.response.defer()
-        group = group.lower().strip().replace(" ", "-")
+        group = self._normalize_slug(group)
         result = await self.scraper.get_group_deals(group, limit=Config.DEFAULT_SEARCH_LIMIT)
 
         await self._send_deals(
@@ -1081,6 +1288,7 @@ class PepperCommands(commands.Cog):
     ):
         await interaction.response.defer(ephemeral=True)
         
+        slug = self._normalize_slug(slug)
         success, error, category_id = await self._validate_and_create_category(
             interaction.guild_id, slug, channel, frequency, time, day, date, min_temp or 0, max_price
         )
@@ -1090,7 +1298,10 @@ class PepperCommands(commands.Cog):
             return
         
         emoji = self.category_manager.get_category_emoji(slug)
-        schedule = {'type': frequency, 'time': time, 'day': day, 'date': date}
+        schedule = {
+            'schedule_type': frequency, 'schedule_time': time,
+            'schedule_day': day, 'schedule_date': date,
+        }
         
         embed = discord.Embed(
             title="✅ Category Added Successfully!",
@@ -1116,7 +1327,7 @@ class PepperCommands(commands.Cog):
     async def category_remove(self, interaction: discord.Interaction, slug: str):
         await interaction.response.defer(ephemeral=True)
         
-        slug = slug.lower().strip()
+        slug = self._normalize_slug(slug)
         
         if slug == 'bilety-lotnicze':
             await interaction.followup.send(
@@ -1127,6 +1338,7 @@ class PepperCommands(commands.Cog):
         
         removed = await self.bot.db.remove_category_config(interaction.guild_id, slug)
         if removed:
+            self._invalidate_schedule()
             await interaction.followup.send(
                 f"🗑️ Category removed: **{slug}**\n\nAll notification history has been deleted.",
                 ephemeral=True
@@ -1148,12 +1360,7 @@ class PepperCommands(commands.Cog):
             )
             return
         
-        embed = self._build_category_list_embed(categories)
-        
-        for field in embed.fields:
-            if 'bilety-lotnicze' in field.name.lower():
-                field.name += " [PROTECTED]"
-        
+        embed = self._build_category_list_embed(categories, mark_protected=True)
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @category_group.command(name="trigger", description="Manually trigger category notification")
@@ -1162,7 +1369,7 @@ class PepperCommands(commands.Cog):
     async def category_trigger(self, interaction: discord.Interaction, slug: str):
         await interaction.response.defer(ephemeral=True)
         
-        slug = slug.lower().strip()
+        slug = self._normalize_slug(slug)
         
         category = await self.bot.db.get_category_by_slug(interaction.guild_id, slug)
         if not category:
@@ -1183,7 +1390,7 @@ class PepperCommands(commands.Cog):
     @app_commands.describe(slug="Category to pause")
     @app_commands.checks.has_permissions(administrator=True)
     async def category_pause(self, interaction: discord.Interaction, slug: str):
-        slug = slug.lower().strip()
+        slug = self._normalize_slug(slug)
         
         if slug == 'bilety-lotnicze':
             await interaction.response.send_message(
@@ -1194,6 +1401,7 @@ class PepperCommands(commands.Cog):
         
         updated = await self.bot.db.update_category_status(interaction.guild_id, slug, 'paused')
         if updated:
+            self._invalidate_schedule()
             await interaction.response.send_message(
                 f"⏸️ Category paused: **{slug}**\n\nUse `/category resume {slug}` to reactivate.",
                 ephemeral=True
@@ -1208,10 +1416,11 @@ class PepperCommands(commands.Cog):
     @app_commands.describe(slug="Category to resume")
     @app_commands.checks.has_permissions(administrator=True)
     async def category_resume(self, interaction: discord.Interaction, slug: str):
-        slug = slug.lower().strip()
+        slug = self._normalize_slug(slug)
         
         updated = await self.bot.db.update_category_status(interaction.guild_id, slug, 'active')
         if updated:
+            self._invalidate_schedule()
             category = await self.bot.db.get_category_by_slug(interaction.guild_id, slug)
             schedule_str = self.category_manager.format_schedule(category)
             
@@ -1230,7 +1439,7 @@ class PepperCommands(commands.Cog):
     async def category_preview(self, interaction: discord.Interaction, slug: str):
         await interaction.response.defer(ephemeral=True)
         
-        slug = slug.lower().strip()
+        slug = self._normalize_slug(slug)
         
         result = await self.scraper.get_group_deals(slug, limit=3)
         
@@ -1261,7 +1470,7 @@ class PepperCommands(commands.Cog):
             
             value = f"💰 {deal.get('price', '???')} | {icon} {temp}° | 🪐 {deal.get('merchant', 'Unknown')}"
             embed.add_field(
-                name=f"{i}. {deal['title'][:60]}...",
+                name=f"{i}. {_truncate(deal['title'], 60)}",
                 value=value,
                 inline=False
             )
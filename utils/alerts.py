@@ -1,93 +1,171 @@
 import asyncio
 import datetime
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from .db import Database
 
 logger = logging.getLogger("PepperBot.Alerts")
 
+# Searches in flight at once during an alert check; PepperScraper spaces their start times
+SEARCH_CONCURRENCY = 3
+# How long alert queries and their subscribers are reused between checks. Every
+# add/remove invalidates them, so this only bounds staleness from outside edits
+# and has to outlast the 15 minute check interval to help at all.
+ALERT_CACHE_TTL = 1800
+
 
 class AlertsManager:
     def __init__(self, db: Database):
         self.db = db
+        self._queries_cache: Optional[Tuple[float, List[str]]] = None
+        self._subs_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        # Bumped on every invalidation so loads that straddle an alert change aren't cached
+        self._cache_generation = 0
 
     async def load_alerts(self):
         pass
 
     async def add_alert(self, user_id: int, query: str, max_price: Optional[float] = None) -> bool:
-        return await self.db.add_alert(user_id, query, max_price)
+        added = await self.db.add_alert(user_id, query, max_price)
+        self._invalidate_cache(query)
+        return added
 
     async def remove_alert(self, user_id: int, query: str) -> bool:
-        return await self.db.remove_alert(user_id, query)
+        removed = await self.db.remove_alert(user_id, query)
+        self._invalidate_cache(query)
+        return removed
+
+    def _invalidate_cache(self, query: str):
+        self._cache_generation += 1
+        self._queries_cache = None
+        self._subs_cache.pop(query, None)
+
+    async def _cached_unique_queries(self) -> List[str]:
+        now = time.monotonic()
+        if self._queries_cache and now - self._queries_cache[0] < ALERT_CACHE_TTL:
+            return self._queries_cache[1]
+        generation = self._cache_generation
+        queries = await self.db.get_all_unique_queries()
+        if generation == self._cache_generation:
+            self._queries_cache = (now, queries)
+        return queries
+
+    async def _cached_subscribers(self, queries: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Subscribers per query, loading every expired or missing query in one DB call."""
+        now = time.monotonic()
+        subscribers = {}
+        missing = []
+        for query in queries:
+            entry = self._subs_cache.get(query)
+            if entry and now - entry[0] < ALERT_CACHE_TTL:
+                subscribers[query] = entry[1]
+            else:
+                missing.append(query)
+
+        if missing:
+            generation = self._cache_generation
+            loaded = await self.db.get_alerts_grouped(missing)
+            if generation == self._cache_generation:
+                self._subs_cache.update((query, (now, subs)) for query, subs in loaded.items())
+            subscribers.update(loaded)
+        return subscribers
 
     async def get_alerts(self, user_id: int) -> List[Dict[str, Any]]:
         return await self.db.get_user_alerts(user_id)
 
     async def check_alerts(self, scraper) -> List[Dict[str, Any]]:
-        from utils.deal_filter import DealFilter
+        from utils.deal_filter import DealFilter, freshness_cutoff
         
         notifications = []
         batch_seen = []
-        seen_in_cycle = set()
-
-        unique_queries = await self.db.get_all_unique_queries()
+        matches = []
+
+        unique_queries = await self._cached_unique_queries()
+        subscribers_by_query = await self._cached_subscribers(unique_queries)
+        # Only scrape queries someone still subscribes to, most-subscribed first
+        unique_queries = sorted(
+            (query for query in unique_queries if subscribers_by_query.get(query)),
+            key=lambda query: len(subscribers_by_query[query]),
+            reverse=True,
+        )
         logger.info(f"Checking {len(unique_queries)} unique queries...")
 
-        for query in unique_queries:
-            result = await scraper.search_deals(query, limit=5, sort="new")
+        sem = asyncio.Semaphore(SEARCH_CONCURRENCY)
 
-            if not result["success"]:
-                continue
+        async def _search(query: str) -> Dict[str, Any]:
+            # Failures stay inside their own task; cancellation still propagates to the cycle
+            try:
+                async with sem:
+                    return await scraper.search_deals(query, limit=5, sort="new")
+            except Exception as e:
+                logger.error(f"Error searching deals for '{query}': {e}")
+                return {"success": False, "error": str(e), "deals": []}
 
-            subscribers = await self.db.get_alerts_by_query(query)
+        results = await asyncio.gather(*(_search(query) for query in unique_queries))
+        posted_after = freshness_cutoff()
 
-            if not subscribers:
+        for query, result in zip(unique_queries, results, strict=True):
+            if not result["success"]:
                 continue
 
+            subscribers = subscribers_by_query[query]
             all_deals = result["deals"]
             filtered_deals = DealFilter.filter_deals(
                 all_deals,
                 check_freshness=True,
                 check_temperature=True,
-                check_price=True
+                check_price=True,
+                posted_after=posted_after,
             )
-
+            matches.append((query, subscribers, filtered_deals))
+
+        # One history lookup for every (alert, deal) pair this cycle could notify about
+        seen_pairs = await self.db.get_seen_pairs({
+            (sub["id"], deal["link"])
+            for _, subscribers, filtered_deals in matches
+            for sub in subscribers
+            for deal in filtered_deals
+        })
+        # Deal links already seen per alert id, so the inner loop needs no tuple keys
+        seen_in_cycle: Dict[int, Set[str]] = defaultdict(set)
+        for alert_id, deal_id in seen_pairs:
+            seen_in_cycle[alert_id].add(deal_id)
+
+        for query, subscribers, filtered_deals in matches:
             for deal in filtered_deals:
                 deal_id = deal["link"]
+                # filter_deals already parsed and cached the price on the deal
+                deal_price = DealFilter.price_of(deal)
 
                 for sub in subscribers:
                     user_id = sub["user_id"]
                     max_price = sub["max_price"]
                     alert_id = sub["id"]
 
-                    cache_key = (alert_id, deal_id)
-                    if cache_key in seen_in_cycle:
+                    seen = seen_in_cycle[alert_id]
+                    if deal_id in seen:
                         continue
 
-                    if await self.db.is_deal_seen_by_alert(alert_id, deal_id):
-                        seen_in_cycle.add(cache_key)
+                    if max_price is not None and deal_price > 0 and deal_price > max_price:
                         continue
 
-                    if max_price is not None:
-                        deal_price = DealFilter._parse_price(deal.get("price"))
-                        if deal_price and deal_price > 0 and deal_price > max_price:
-                            continue
-
                     notifications.append({
                         "user_id": user_id,
                         "deal": deal,
                         "query": query
                     })
-                    batch_seen.append(cache_key)
-                    seen_in_cycle.add(cache_key)
-
-            if len(unique_queries) > 5:
-                await asyncio.sleep(1.5)
+                    batch_seen.append((alert_id, deal_id))
+                    seen.add(deal_id)
 
         if batch_seen:
             await self.db.mark_deals_seen_batch(batch_seen)
             logger.info(f"Batch marked {len(batch_seen)} deals as seen")
 
-        logger.info(f"Alert check complete: {len(notifications)} notifications, {len(seen_in_cycle)} cached checks")
+        logger.info(
+            f"Alert check complete: {len(notifications)} notifications, "
+            f"{len(seen_pairs)} already-seen pairs skipped"
+        )
         return notifications
\ No newline at end of file
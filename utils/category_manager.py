@@ -1,4 +1,5 @@
 import datetime
+import functools
 import logging
 import re
 from typing import Any, Dict, List, Optional
@@ -11,6 +12,52 @@ from .scraper import PepperScraper
 
 logger = logging.getLogger("PepperBot.CategoryManager")
 
+# Runs are accepted this many seconds either side of the scheduled time
+SCHEDULE_WINDOW_SECONDS = 120
+
+_WEEKDAYS = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6
+}
+WEEKDAY_NAMES = frozenset(_WEEKDAYS)
+
+_CATEGORY_EMOJIS = {
+    'bilety-lotnicze': '✈️',
+    'podzespoly-komputerowe': '💻',
+    'smartfony': '📱',
+    'gry': '🎮',
+    'lego': '🧱',
+    'laptopy': '💻',
+    'dom-i-ogrod': '🏡',
+    'narzedzia': '🔧',
+    'elektronika': '⚡',
+    'konsole': '🎮',
+    'moda-i-akcesoria': '👔',
+    'zabawki': '🧸',
+    'sport-i-wypoczynek': '⚽',
+    'ksiazki': '📚',
+    'zdrowie-i-uroda': '💄',
+    'jedzenie-i-napoje': '🍕',
+    'dom-i-meble': '🛋️',
+    'tv-audio-foto': '📺',
+    'auto-moto': '🚗',
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _format_schedule_cached(
+    schedule_type: str, time: str, day: Optional[str], date: Optional[int]
+) -> str:
+    if schedule_type == 'daily':
+        return f"Daily at {time}"
+    elif schedule_type == 'weekly':
+        return f"Weekly ({day.capitalize()}) at {time}"
+    elif schedule_type == 'biweekly':
+        return f"Biweekly ({day.capitalize()}) at {time}"
+    elif schedule_type == 'monthly':
+        return f"Monthly (day {date}) at {time}"
+    return "Unknown schedule"
+
 
 class CategoryManager:
     def __init__(self, db: Database):
@@ -72,9 +119,8 @@ class CategoryManager:
         if schedule['type'] == 'monthly' and (date < 1 or date > 31):
             return False, None, "Monthly date must be between 1-31"
         
-        valid_days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        if day and day.lower() not in valid_days:
-            return False, None, f"Day must be one of: {', '.join(valid_days)}"
+        if day and day.lower() not in WEEKDAY_NAMES:
+            return False, None, f"Day must be one of: {', '.join(_WEEKDAYS)}"
         
         return True, schedule, None
 
@@ -101,7 +147,7 @@ class CategoryManager:
         # IMPROVED: Check if we're within 2-minute window of scheduled time
         # This prevents missing runs if task runs at 08:59 instead of 09:00
         time_diff_seconds = abs((now - scheduled_today).total_seconds())
-        within_time_window = time_diff_seconds < 120  # 2-minute window
+        within_time_window = time_diff_seconds < SCHEDULE_WINDOW_SECONDS
         
         if not within_time_window:
             return False
@@ -124,11 +170,7 @@ class CategoryManager:
             return True
         
         if category['schedule_type'] in ['weekly', 'biweekly']:
-            day_map = {
-                'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
-                'friday': 4, 'saturday': 5, 'sunday': 6
-            }
-            target_day = day_map.get(category['schedule_day'])
+            target_day = _WEEKDAYS.get(category['schedule_day'])
             if target_day is None or now.weekday() != target_day:
                 return False
             
@@ -150,39 +192,57 @@ class CategoryManager:
         
         return False
 
+    def next_run_at(
+        self, category: Dict[str, Any], after: datetime.datetime
+    ) -> Optional[datetime.datetime]:
+        """
+        Next scheduled slot at or after `after`, or None for an unusable schedule.
+        Biweekly categories get their weekly slot; should_run_now enforces the gap.
+        """
+        try:
+            hour, minute = (int(part) for part in category['schedule_time'].split(':'))
+            # Out-of-range values such as 24:00 are rejected by replace()
+            candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        except (ValueError, TypeError, AttributeError):
+            return None
+        
+        if candidate < after:
+            candidate += datetime.timedelta(days=1)
+        
+        schedule_type = category['schedule_type']
+        target_day = _WEEKDAYS.get(category.get('schedule_day'))
+        
+        # A year covers every weekday and every day-of-month that exists
+        for _ in range(366):
+            if schedule_type == 'daily':
+                return candidate
+            if schedule_type in ('weekly', 'biweekly'):
+                if target_day is None:
+                    return None
+                if candidate.weekday() == target_day:
+                    return candidate
+            elif schedule_type == 'monthly':
+                if candidate.day == category.get('schedule_date'):
+                    return candidate
+            else:
+                return None
+            candidate += datetime.timedelta(days=1)
+        
+        return None
+
     def format_schedule(self, category: Dict[str, Any]) -> str:
         """Format schedule configuration for display."""
-        if category['schedule_type'] == 'daily':
-            return f"Daily at {category['schedule_time']}"
-        elif category['schedule_type'] == 'weekly':
-            return f"Weekly ({category['schedule_day'].capitalize()}) at {category['schedule_time']}"
-        elif category['schedule_type'] == 'biweekly':
-            return f"Biweekly ({category['schedule_day'].capitalize()}) at {category['schedule_time']}"
-        elif category['schedule_type'] == 'monthly':
-            return f"Monthly (day {category['schedule_date']}) at {category['schedule_time']}"
-        return "Unknown schedule"
+        return _format_schedule_cached(
+            category['schedule_type'],
+            category['schedule_time'],
+            category.get('schedule_day'),
+            category.get('schedule_date'),
+        )
 
     def get_category_emoji(self, slug: str) -> str:
         """Get emoji for category based on slug."""
-        emoji_map = {
-            'bilety-lotnicze': '✈️',
-            'podzespoly-komputerowe': '💻',
-            'smartfony': '📱',
-            'gry': '🎮',
-            'lego': '🧱',
-            'laptopy': '💻',
-            'dom-i-ogrod': '🏡',
-            'narzedzia': '🔧',
-            'elektronika': '⚡',
-            'konsole': '🎮',
-            'moda-i-akcesoria': '👔',
-            'zabawki': '🧸',
-            'sport-i-wypoczynek': '⚽',
-            'ksiazki': '📚',
-            'zdrowie-i-uroda': '💄',
-            'jedzenie-i-napoje': '🍕',
-            'dom-i-meble': '🛋️',
-            'tv-audio-foto': '📺',
-            'auto-moto': '🚗',
-        }
-        return emoji_map.get(slug, '📂')
\ No newline at end of file
+        return _CATEGORY_EMOJIS.get(slug, '📂')
+
+    def get_category_emojis(self, slugs: List[str]) -> Dict[str, str]:
+        """Get emojis for several categories at once, keyed by slug."""
+        return {slug: _CATEGORY_EMOJIS.get(slug, '📂') for slug in slugs}
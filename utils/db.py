@@ -1,11 +1,21 @@
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import aiosqlite
 
 logger = logging.getLogger("PepperBot.Database")
 
+# (alert_id, deal_id) pairs per lookup query, two bound parameters each
+SEEN_PAIRS_CHUNK = 400
+# Values per IN (...) list, below SQLite's 999-parameter limit before 3.32
+IN_LIST_CHUNK = 500
+
+
+def _placeholders(count: int, marker: str = "?") -> str:
+    """Comma-separated bound-parameter markers for an IN (...) list of count items."""
+    return ",".join([marker] * count)
+
 
 class Database:
     def __init__(self, db_name="pepperbot.db"):
@@ -122,28 +132,28 @@ class Database:
         """Placeholder if we need to close persistent connections later."""
         pass
 
-    async def add_sent_deal(self, deal_id: str):
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute("INSERT OR IGNORE INTO sent_deals (deal_id) VALUES (?)", (deal_id,))
-            await db.commit()
-
-    async def is_deal_sent(self, deal_id: str) -> bool:
+    async def get_sent_subset(self, deal_ids: List[str]) -> Set[str]:
+        """Return the subset of deal_ids already recorded in sent_deals."""
+        if not deal_ids:
+            return set()
+        placeholders = _placeholders(len(deal_ids))
         async with aiosqlite.connect(self.db_name) as db:
             async with db.execute(
-                "SELECT 1 FROM sent_deals WHERE deal_id = ?", (deal_id,)
+                f"SELECT deal_id FROM sent_deals "  # noqa: S608 - only ? markers interpolated
+                f"WHERE deal_id IN ({placeholders})",
+                deal_ids,
             ) as cursor:
-                return await cursor.fetchone() is not None
+                return {row[0] for row in await cursor.fetchall()}
 
-    async def cleanup_old_deals(self, days=30):
-        """Clean up old sent deals to prevent database bloat."""
+    async def add_sent_deals_batch(self, deal_ids: List[str]):
+        if not deal_ids:
+            return
         async with aiosqlite.connect(self.db_name) as db:
-            cursor = await db.execute(
-                "DELETE FROM sent_deals WHERE sent_at < datetime('now', ?)", (f"-{days} days",)
+            await db.executemany(
+                "INSERT OR IGNORE INTO sent_deals (deal_id) VALUES (?)",
+                [(deal_id,) for deal_id in deal_ids],
             )
-            deleted = cursor.rowcount
             await db.commit()
-            logger.info(f"Cleaned up {deleted} old sent deals (older than {days} days)")
-            return deleted
 
     async def add_alert(self, user_id: int, query: str, max_price: Optional[float] = None) -> bool:
         """Adds or updates an alert."""
@@ -186,21 +196,45 @@ class Database:
                 rows = await cursor.fetchall()
                 return [row[0] for row in rows]
 
-    async def get_alerts_by_query(self, query: str) -> List[Dict[str, Any]]:
-        """Returns all alerts watching a specific query."""
+    async def get_alerts_grouped(self, queries: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Returns the alerts watching each of the given queries, keyed by query."""
+        grouped: Dict[str, List[Dict[str, Any]]] = {query: [] for query in queries}
+        if not queries:
+            return grouped
+        unique = list(grouped)
         async with aiosqlite.connect(self.db_name) as db:
             db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM alerts WHERE query = ?", (query,)) as cursor:
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
-
-    async def is_deal_seen_by_alert(self, alert_id: int, deal_id: str) -> bool:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(unique), IN_LIST_CHUNK):
+                chunk = unique[start:start + IN_LIST_CHUNK]
+                async with db.execute(
+                    f"SELECT * FROM alerts "  # noqa: S608 - only ? markers interpolated
+                    f"WHERE query IN ({_placeholders(len(chunk))})",
+                    chunk,
+                ) as cursor:
+                    for row in await cursor.fetchall():
+                        grouped[row["query"]].append(dict(row))
+        return grouped
+
+    async def get_seen_pairs(self, pairs: Iterable[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+        """Return the (alert_id, deal_id) pairs already recorded in alert_history."""
+        pairs = list(pairs)
+        seen = set()
+        if not pairs:
+            return seen
         async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute(
-                "SELECT 1 FROM alert_history WHERE alert_id = ? AND deal_id = ?",
-                (alert_id, deal_id),
-            ) as cursor:
-                return await cursor.fetchone() is not None
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(pairs), SEEN_PAIRS_CHUNK):
+                chunk = pairs[start:start + SEEN_PAIRS_CHUNK]
+                values = _placeholders(len(chunk), "(?, ?)")
+                params = [value for pair in chunk for value in pair]
+                async with db.execute(
+                    f"SELECT alert_id, deal_id "  # noqa: S608 - only ? markers interpolated
+                    f"FROM alert_history WHERE (alert_id, deal_id) IN (VALUES {values})",
+                    params,
+                ) as cursor:
+                    seen.update((row[0], row[1]) for row in await cursor.fetchall())
+        return seen
 
     async def mark_deal_seen(self, alert_id: int, deal_id: str):
         async with aiosqlite.connect(self.db_name) as db:
@@ -285,6 +319,16 @@ class Database:
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
 
+    async def get_guild_category_summary(self, guild_id: int) -> Dict[str, Any]:
+        """Return the configured slugs and their count for a guild in one query."""
+        async with aiosqlite.connect(self.db_name) as db:
+            async with db.execute(
+                "SELECT slug FROM category_configs WHERE guild_id = ?", (guild_id,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+                slugs = {row[0] for row in rows}
+                return {"slugs": slugs, "count": len(slugs)}
+
     async def get_category_by_slug(self, guild_id: int, slug: str) -> Optional[Dict[str, Any]]:
         async with aiosqlite.connect(self.db_name) as db:
             db.row_factory = aiosqlite.Row
@@ -308,13 +352,23 @@ class Database:
             await db.commit()
             return cursor.rowcount > 0
 
-    async def update_category_last_run(self, category_id: int):
+    async def disable_categories_for_channels(self, channel_ids: List[int]) -> int:
+        """Disable every category that posts to one of the given channels."""
+        if not channel_ids:
+            return 0
+
+        placeholders = _placeholders(len(channel_ids))
         async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(
-                "UPDATE category_configs SET last_run = CURRENT_TIMESTAMP WHERE id = ?",
-                (category_id,),
+            cursor = await db.execute(
+                f"""
+                UPDATE category_configs
+                SET status = 'disabled', updated_at = CURRENT_TIMESTAMP
+                WHERE status != 'disabled' AND channel_id IN ({placeholders})
+                """,  # noqa: S608 - only ? markers interpolated
+                tuple(channel_ids),
             )
             await db.commit()
+            return cursor.rowcount
 
     async def get_active_categories_for_schedule(self) -> List[Dict[str, Any]]:
         async with aiosqlite.connect(self.db_name) as db:
@@ -325,13 +379,36 @@ class Database:
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
 
-    async def is_category_deal_sent(self, category_id: int, deal_id: str) -> bool:
+    async def get_categories_by_ids(self, category_ids: List[int]) -> List[Dict[str, Any]]:
+        """Return the active categories among the given ids."""
+        if not category_ids:
+            return []
+
+        placeholders = _placeholders(len(category_ids))
         async with aiosqlite.connect(self.db_name) as db:
+            db.row_factory = aiosqlite.Row
             async with db.execute(
-                "SELECT 1 FROM category_sent_deals WHERE category_id = ? AND deal_id = ?",
-                (category_id, deal_id),
+                f"SELECT * FROM category_configs "  # noqa: S608 - only ? markers interpolated
+                f"WHERE status = 'active' AND id IN ({placeholders}) ORDER BY guild_id, id",
+                tuple(category_ids),
             ) as cursor:
-                return await cursor.fetchone() is not None
+                rows = await cursor.fetchall()
+                return [dict(row) for row in rows]
+
+    async def get_sent_deal_ids(self, category_id: int, deal_ids: List[str]) -> Set[str]:
+        """Return the subset of deal_ids already sent for a category in one query."""
+        if not deal_ids:
+            return set()
+
+        placeholders = _placeholders(len(deal_ids))
+        async with aiosqlite.connect(self.db_name) as db:
+            async with db.execute(
+                f"SELECT deal_id "  # noqa: S608 - only ? markers interpolated
+                f"FROM category_sent_deals WHERE category_id = ? AND deal_id IN ({placeholders})",
+                (category_id, *deal_ids),
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return {row[0] for row in rows}
 
     async def mark_category_deal_sent(self, category_id: int, deal_id: str):
         async with aiosqlite.connect(self.db_name) as db:
@@ -351,20 +428,30 @@ class Database:
             )
             await db.commit()
 
-    async def cleanup_category_deals(self, days: int = 30):
-        """Clean up old category sent deals to prevent database bloat."""
+    async def update_category_stats(self, category_id: int, deals_found: int, deals_sent: int, errors: int = 0):
         async with aiosqlite.connect(self.db_name) as db:
-            cursor = await db.execute(
-                "DELETE FROM category_sent_deals WHERE sent_at < datetime('now', ?)",
-                (f"-{days} days",),
+            await db.execute(
+                """
+                INSERT INTO category_stats (category_id, date, deals_found, deals_sent, scrape_errors)
+                VALUES (?, DATE('now'), ?, ?, ?)
+                ON CONFLICT(category_id, date) DO UPDATE SET
+                    deals_found = deals_found + excluded.deals_found,
+                    deals_sent = deals_sent + excluded.deals_sent,
+                    scrape_errors = scrape_errors + excluded.scrape_errors
+                """,
+                (category_id, deals_found, deals_sent, errors),
             )
-            deleted = cursor.rowcount
             await db.commit()
-            logger.info(f"Cleaned up {deleted} old category deals (older than {days} days)")
-            return deleted
 
-    async def update_category_stats(self, category_id: int, deals_found: int, deals_sent: int, errors: int = 0):
+    async def finalize_category_run(
+        self, category_id: int, deals_found: int, deals_sent: int, errors: int = 0
+    ):
+        """Record last_run and the day's stats for a category in a single transaction."""
         async with aiosqlite.connect(self.db_name) as db:
+            await db.execute(
+                "UPDATE category_configs SET last_run = CURRENT_TIMESTAMP WHERE id = ?",
+                (category_id,),
+            )
             await db.execute(
                 """
                 INSERT INTO category_stats (category_id, date, deals_found, deals_sent, scrape_errors)
@@ -376,4 +463,19 @@ class Database:
                 """,
                 (category_id, deals_found, deals_sent, errors),
             )
-            await db.commit()
\ No newline at end of file
+            await db.commit()
+
+    async def cleanup_all(self, days: int = 30) -> Tuple[int, int]:
+        """Clean up old flight and category sent deals in a single transaction."""
+        async with aiosqlite.connect(self.db_name) as db:
+            cutoff = (f"-{days} days",)
+            cursor = await db.execute(
+                "DELETE FROM sent_deals WHERE sent_at < datetime('now', ?)", cutoff
+            )
+            deleted_deals = cursor.rowcount
+            cursor = await db.execute(
+                "DELETE FROM category_sent_deals WHERE sent_at < datetime('now', ?)", cutoff
+            )
+            deleted_category_deals = cursor.rowcount
+            await db.commit()
+            return deleted_deals, deleted_category_deals
@@ -1,5 +1,7 @@
-import datetime
 import logging
+import re
+import time
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger("PepperBot.DealFilter")
@@ -8,6 +10,28 @@ FRESHNESS_CUTOFF_HOURS = 24
 MIN_TEMPERATURE = 50
 MAX_REASONABLE_PRICE = 1000000
 
+_PRICE_FREE_RE = re.compile(r'darm|free|bezpłatn', re.IGNORECASE)
+_PRICE_CURRENCY_RE = re.compile(r'zł', re.IGNORECASE)
+# Drops thousands separators (plain, no-break and narrow no-break spaces) and swaps the decimal comma
+_PRICE_TRANS = str.maketrans({' ': None, '\xa0': None, '\u202f': None, '\t': None, ',': '.'})
+
+
+@lru_cache(maxsize=4096)
+def _parse_price_str(price_str: str) -> Optional[float]:
+    # The same price strings recur across queries, categories and cycles
+    if _PRICE_FREE_RE.search(price_str):
+        return 0.0
+    try:
+        return float(_PRICE_CURRENCY_RE.sub('', price_str).translate(_PRICE_TRANS))
+    except ValueError:
+        logger.warning(f"Failed to parse price: {price_str}")
+        return None
+
+
+def freshness_cutoff() -> float:
+    """Unix time before which a deal counts as stale; compute once per check cycle."""
+    return time.time() - FRESHNESS_CUTOFF_HOURS * 3600
+
 
 class DealFilter: 
     @staticmethod
@@ -19,46 +43,40 @@ class DealFilter:
         check_price: bool = True,
         min_temperature: Optional[int] = None,
         max_price: Optional[float] = None,
+        posted_after: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         if not deals:
             return []
         
         filtered = []
-        current_time = datetime.datetime.now()
-        freshness_cutoff = current_time - datetime.timedelta(hours=FRESHNESS_CUTOFF_HOURS)
+        if check_freshness and posted_after is None:
+            posted_after = freshness_cutoff()
         min_temp_threshold = min_temperature if min_temperature is not None else MIN_TEMPERATURE
+        # Free deals (price 0) always pass the max price check
+        price_ceiling = max(max_price, 0.0) if max_price is not None else float('inf')
         
         for deal in deals:
             if check_freshness:
                 posted_time = deal.get("posted_timestamp")
                 
-                if posted_time:
-                    if isinstance(posted_time, str):
-                        try:
-                            posted_time = datetime.datetime.fromisoformat(
-                                posted_time.replace('Z', '+00:00')
-                            )
-                        except ValueError:
-                            posted_time = None
-                    
-                    if posted_time and posted_time < freshness_cutoff:
-                        logger.debug(
-                            f"Skipping old deal (posted {posted_time}): "
-                            f"{deal.get('link', 'unknown')}"
-                        )
-                        continue
+                if posted_time and posted_time < posted_after:
+                    logger.debug(
+                        "Skipping old deal (posted %s): %s",
+                        posted_time, deal.get('link', 'unknown')
+                    )
+                    continue
             
             if check_temperature:
                 temp = deal.get('temperature', 0)
                 if temp < min_temp_threshold:
                     logger.debug(
-                        f"Skipping low-temperature deal ({temp}°): "
-                        f"{deal.get('link', 'unknown')}"
+                        "Skipping low-temperature deal (%s°): %s",
+                        temp, deal.get('link', 'unknown')
                     )
                     continue
             
             if check_price:
-                deal_price = DealFilter._parse_price(deal.get("price"))
+                deal_price = DealFilter.price_of(deal)
                 
                 if deal_price is None:
                     logger.warning(
@@ -73,10 +91,10 @@ class DealFilter:
                     )
                     continue
                 
-                if max_price is not None and deal_price > 0 and deal_price > max_price:
+                if deal_price > price_ceiling:
                     logger.debug(
-                        f"Skipping deal above max price ({deal_price} > {max_price}): "
-                        f"{deal.get('link', 'unknown')}"
+                        "Skipping deal above max price (%s > %s): %s",
+                        deal_price, max_price, deal.get('link', 'unknown')
                     )
                     continue
             
@@ -91,20 +109,22 @@ class DealFilter:
         
         return filtered
     
+    @staticmethod
+    def price_of(deal: Dict[str, Any]) -> Optional[float]:
+        """Parsed price of a deal, cached on the deal under "_price_num"."""
+        try:
+            return deal["_price_num"]
+        except KeyError:
+            price = deal["_price_num"] = DealFilter._parse_price(deal.get("price"))
+            return price
+
     @staticmethod
     def _parse_price(price_str: Optional[str]) -> Optional[float]:
+        if isinstance(price_str, (int, float)):
+            return float(price_str)
         if not price_str:
             return None
-        
-        try:
-            clean = price_str.lower().replace("zł", "").replace(" ", "").replace(",", ".")
-            if any(keyword in clean for keyword in ["darm", "free", "bezpłatn"]):
-                return 0.0  
-            return float(clean)
-        
-        except ValueError:
-            logger.warning(f"Failed to parse price: {price_str}")
-            return None
+        return _parse_price_str(price_str)
     
     @staticmethod
     def get_filter_summary(
@@ -2,7 +2,10 @@ import asyncio
 import datetime
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import random
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from urllib.parse import quote
 
 import aiohttp
@@ -10,6 +13,34 @@ from selectolax.parser import HTMLParser
 
 logger = logging.getLogger("PepperBot.Scraper")
 
+# Vue component name carried by every deal card's data-vue3 payload
+THREAD_NORMALIZER = "ThreadMainListItemNormalizer"
+THREAD_NORMALIZER_BYTES = THREAD_NORMALIZER.encode()
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Full-jitter exponential backoff: attempt n sleeps up to min(MAX, BASE * 2**n) seconds
+RETRY_BACKOFF_BASE = 2.0
+RETRY_BACKOFF_MAX = 30.0
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    if retry_after:
+        try:
+            return min(float(retry_after), RETRY_BACKOFF_MAX)
+        except ValueError:
+            pass
+    # Jitter only spreads retries out; it is not security-sensitive
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))  # noqa: S311
+
+
+@lru_cache(maxsize=2048)
+def _parse_iso(value: str) -> Optional[float]:
+    """Unix seconds for an ISO timestamp; the same deals reappear across scrapes."""
+    try:
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
 
 class PepperScraper:
 
@@ -21,30 +52,95 @@ class PepperScraper:
         "Referer": "https://www.pepper.pl/",
     }
 
+    # Selectors for the plain-HTML fallback when a page carries no Vue thread data
+    _SEL_ARTICLE = 'article.thread'
+    _SEL_TITLE = '.thread-title a'
+    _SEL_PRICE = '.thread-price'
+    _SEL_TEMP = '.vote-temp'
+    _SEL_MERCHANT = '.thread-card-merchant'
+    _SEL_IMAGE = 'img.thread-image'
+
+    # Minimum spacing between outbound requests of each kind, shared by all instances
+    REQUEST_INTERVALS = {"group": 2.0, "search": 1.5}
+    _request_locks = {kind: asyncio.Lock() for kind in REQUEST_INTERVALS}
+    _last_request = dict.fromkeys(REQUEST_INTERVALS, 0.0)
+
+    # How long a successful page result is reused for the same request
+    GROUP_CACHE_TTL = 60
+    SEARCH_CACHE_TTL = 60
+
+    _SORT_PARAMS = {"new": "&sort=new", "hot": "&sort=hot", "relevance": ""}
+
     def __init__(self, session: aiohttp.ClientSession):
         self.session = session
+        self._cache: Dict[tuple, tuple] = {}
+        self._inflight: Dict[tuple, asyncio.Task] = {}
 
     async def search_deals(
         self, query: str, limit: int = 7, sort: str = "relevance"
     ) -> Dict[str, Any]:
-        sort_param = ""
-        if sort == "new":
-            sort_param = "&sort=new"
-        elif sort == "hot":
-            sort_param = "&sort=hot"
+        search_url = f"{self.BASE_URL}/search?q={quote(query)}{self._SORT_PARAMS.get(sort, '')}"
+        return await self._shared_fetch(
+            ("search", search_url, limit),
+            self.SEARCH_CACHE_TTL,
+            lambda: self._fetch_search(search_url, limit, context=f"search: {query} ({sort})"),
+        )
 
-        search_url = f"{self.BASE_URL}/search?q={quote(query)}{sort_param}"
-        return await self._fetch_and_parse(search_url, limit, context=f"search: {query} ({sort})")
+    async def _fetch_search(self, url: str, limit: int, context: str) -> Dict[str, Any]:
+        await self._wait_for_slot("search")
+        return await self._fetch_and_parse(url, limit, context=context)
 
     async def get_hot_deals(self, limit: int = 7) -> Dict[str, Any]:
         return await self._fetch_and_parse(self.BASE_URL, limit, context="hot deals")
 
     async def get_group_deals(self, group_slug: str, limit: int = 7) -> Dict[str, Any]:
+        return await self._shared_fetch(
+            ("group", group_slug, limit),
+            self.GROUP_CACHE_TTL,
+            lambda: self._fetch_group_deals(group_slug, limit),
+        )
+
+    async def _fetch_group_deals(self, group_slug: str, limit: int) -> Dict[str, Any]:
         from .config import Config
 
         url = Config.GROUP_URL_TEMPLATE.format(group_slug)
+        await self._wait_for_slot("group")
         return await self._fetch_and_parse(url, limit, context=f"group: {group_slug}")
 
+    async def _shared_fetch(
+        self, key: tuple, ttl: float, fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Reuse a recent successful result for key, and let concurrent callers share one fetch."""
+        entry = self._cache.get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_cache(key, ttl, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_and_cache(
+        self, key: tuple, ttl: float, fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        result = await fetch()
+        if result["success"]:
+            now = time.monotonic()
+            self._cache = {k: v for k, v in self._cache.items() if now < v[0]}
+            self._cache[key] = (now + ttl, result)
+        return result
+
+    async def _wait_for_slot(self, kind: str):
+        """Stagger outbound requests of one kind so concurrent callers don't burst Pepper.pl."""
+        async with PepperScraper._request_locks[kind]:
+            last = PepperScraper._last_request[kind]
+            delay = last + self.REQUEST_INTERVALS[kind] - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            PepperScraper._last_request[kind] = time.monotonic()
+
     async def get_flight_deals(self, limit: int = 10) -> Dict[str, Any]:
         from .config import Config
 
@@ -63,12 +159,16 @@ class PepperScraper:
                 ) as response:
                     if response.status != 200:
                         logger.warning(f"HTTP {response.status} for {url}")
-                        if response.status in [429, 500, 502, 503, 504]:
-                            await asyncio.sleep(2 * (attempt + 1))
+                        if response.status in RETRY_STATUSES:
+                            if attempt < retries - 1:
+                                await asyncio.sleep(
+                                    _retry_delay(attempt, response.headers.get("Retry-After"))
+                                )
                             continue
                         return {"success": False, "error": f"HTTP {response.status}", "deals": []}
 
-                    html = await response.text()
+                    # selectolax decodes the raw body itself, so skip aiohttp's str decode
+                    html = await response.read()
                     
                     deals = self._extract_deals_from_html(html)
                     
@@ -79,39 +179,37 @@ class PepperScraper:
                 if attempt == retries - 1:
                     logger.error(f"Failed to fetch {context} after {retries} attempts", exc_info=True)
                     return {"success": False, "error": str(e), "deals": []}
-                await asyncio.sleep(2 * (attempt + 1))
+                await asyncio.sleep(_retry_delay(attempt))
             except Exception as e:
                 logger.error(f"Unexpected error fetching {context}: {e}", exc_info=True)
                 return {"success": False, "error": str(e), "deals": []}
 
         return {"success": False, "error": "Max retries exceeded", "deals": []}
 
-    def _extract_deals_from_html(self, html: str) -> List[Dict[str, Any]]:
+    def _extract_deals_from_html(self, html: bytes) -> List[Dict[str, Any]]:
         deals = []
         try:
             tree = HTMLParser(html)
             
-            vue_elements = tree.css('[data-vue3]')
-            for element in vue_elements:
-                data_str = element.attributes.get('data-vue3', '')
-                if "ThreadMainListItemNormalizer" not in data_str:
-                    continue
-                try:
-                    vue_data = json.loads(data_str)
-                    if "props" in vue_data and "thread" in vue_data["props"]:
-                        thread = vue_data["props"]["thread"]
-                        deal = self._parse_thread_data(thread)
-                        if deal:
-                            deals.append(deal)
-                except json.JSONDecodeError:
-                    continue
+            # Pages without thread cards skip the Vue pass and go straight to the fallback
+            if THREAD_NORMALIZER_BYTES in html:
+                for element in tree.css(f'[data-vue3*="{THREAD_NORMALIZER}"]'):
+                    try:
+                        vue_data = json.loads(element.attributes.get('data-vue3', ''))
+                        if "props" in vue_data and "thread" in vue_data["props"]:
+                            thread = vue_data["props"]["thread"]
+                            deal = self._parse_thread_data(thread)
+                            if deal:
+                                deals.append(deal)
+                    except json.JSONDecodeError:
+                        continue
 
             if deals:
                 logger.info(f"Extracted {len(deals)} deals using Vue method (selectolax)")
                 return deals
 
             logger.info("Vue extraction yielded 0 deals. Trying HTML fallback...")
-            articles = tree.css('article.thread')
+            articles = tree.css(self._SEL_ARTICLE)
             for article in articles:
                 deal = self._parse_article_html_selectolax(article)
                 if deal:
@@ -125,7 +223,7 @@ class PepperScraper:
 
     def _parse_article_html_selectolax(self, article) -> Optional[Dict[str, Any]]:
         try:
-            title_elem = article.css_first('.thread-title a')
+            title_elem = article.css_first(self._SEL_TITLE)
             if not title_elem:
                 return None
 
@@ -134,20 +232,20 @@ class PepperScraper:
             if link and not link.startswith('http'):
                 link = f"{self.BASE_URL}{link}"
 
-            price_elem = article.css_first('.thread-price')
+            price_elem = article.css_first(self._SEL_PRICE)
             price = price_elem.text(strip=True) if price_elem else None
 
-            temp_elem = article.css_first('.vote-temp')
+            temp_elem = article.css_first(self._SEL_TEMP)
             temp_str = temp_elem.text(strip=True).replace('°', '') if temp_elem else '0'
             try:
                 temp = int(temp_str)
             except:
                 temp = 0
 
-            merchant_elem = article.css_first('.thread-card-merchant')
+            merchant_elem = article.css_first(self._SEL_MERCHANT)
             merchant = merchant_elem.text(strip=True) if merchant_elem else "Nieznany"
 
-            img_elem = article.css_first('img.thread-image')
+            img_elem = article.css_first(self._SEL_IMAGE)
             image_url = img_elem.attributes.get('src') if img_elem else None
 
             return {
@@ -172,7 +270,7 @@ class PepperScraper:
             is_expired = thread.get("isExpired", False)
             is_archived = thread.get("isArchived", False)
             
-            if is_expired or is_archived or status in ["expired", "archived", "deleted"]:
+            if is_expired or is_archived or status in ("expired", "archived", "deleted"):
                 logger.debug(f"Skipping unavailable deal: status={status}, expired={is_expired}")
                 return None
             
@@ -186,49 +284,45 @@ class PepperScraper:
                 link = thread.get("shareableLink", "")
 
             price = thread.get("price")
-            price_str = f"{price} zł" if price else None
-
             next_best = thread.get("nextBestPrice")
-            next_best_str = f"{next_best} zł" if next_best else None
 
             temp = thread.get("temperature", 0)
             try:
-                temp = float(temp) if isinstance(temp, (int, float, str)) else 0
-            except ValueError:
+                temp = int(float(temp))
+            except (TypeError, ValueError, OverflowError):
                 temp = 0
 
-            merchant_data = thread.get("merchant", {})
-            merchant = (
-                merchant_data.get("merchantName", "Nieznany")
-                if isinstance(merchant_data, dict)
-                else "Nieznany"
-            )
+            try:
+                merchant = thread["merchant"].get("merchantName", "Nieznany")
+            except (KeyError, AttributeError):
+                merchant = "Nieznany"
 
             image_url = None
-            main_image = thread.get("mainImage", {})
-            if isinstance(main_image, dict):
-                path = main_image.get("path")
+            try:
+                main_image = thread["mainImage"]
                 name = main_image.get("name")
-                ext = main_image.get("ext")
-                if path and name:
+                if main_image.get("path") and name:
                     image_url = (
-                        f"https://static.pepper.pl/{path}/{name}/re/600x600/qt/80/{name}.{ext}"
+                        f"https://static.pepper.pl/{main_image['path']}/{name}"
+                        f"/re/600x600/qt/80/{name}.{main_image.get('ext')}"
                     )
+            except (KeyError, AttributeError):
+                pass
 
+            # Unix seconds, so freshness checks downstream are plain float comparisons
             published_at = thread.get("publishedAt")
             posted_timestamp = None
-            if published_at:
-                try:
-                    posted_timestamp = datetime.datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                except (ValueError, AttributeError):
-                    posted_timestamp = None
+            if isinstance(published_at, (int, float)):
+                posted_timestamp = float(published_at)
+            elif isinstance(published_at, str) and published_at:
+                posted_timestamp = _parse_iso(published_at)
 
             return {
                 "title": title,
                 "link": link,
-                "price": price_str,
-                "next_best_price": next_best_str,
-                "temperature": int(temp),
+                "price": f"{price} zł" if price else None,
+                "next_best_price": f"{next_best} zł" if next_best else None,
+                "temperature": temp,
                 "merchant": merchant,
                 "image_url": image_url,
                 "voucher_code": thread.get("voucherCode", ""),